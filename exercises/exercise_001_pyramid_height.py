@@ -16,41 +16,127 @@
 #   Repeatedly subtract the blocks required for each layer, starting
 #   from 1 and increasing by 1 each time. Count how many full layers
 #   can be completed.
+#
+#   Faster alternative: the closed-form solver below inverts the
+#   triangular-number formula, and a batch version handles many
+#   block counts at once (importable: run the loops as a script).
 # ============================================================
 
+import math
+
+try:
+    import numpy as np  # optional, only used by pyramid_heights()
+except ImportError:
+    np = None
+
+
+# ------------------------------------------------------------
+# CLOSED-FORM SOLUTION (triangular-number inverse)
+# ------------------------------------------------------------
+# h full layers need 1 + 2 + ... + h = h * (h + 1) // 2 blocks.
+# The height is the largest h with h * (h + 1) // 2 <= blocks:
+#   h = (isqrt(8 * blocks + 1) - 1) // 2
+# math.isqrt works on exact integers, so there is no float rounding,
+# even for block counts with hundreds of digits.
+
+def pyramid_height(blocks):
+    if blocks < 1:
+        return 0  # same result as the loops: no layer can be built
+    return (math.isqrt(8 * blocks + 1) - 1) // 2
+
 
 # ------------------------------------------------------------
-# WHILE-LOOP SOLUTION
+# BATCH SOLUTION (many block counts at once)
 # ------------------------------------------------------------
-# This version is direct because we don't know how many layers
-# will fit. We keep subtracting until the next layer can't be built.
+# With NumPy, the whole array is solved in one vectorized pass:
+# a float sqrt gives a first guess, then one correction step on each
+# side fixes any rounding error. Counts above _NUMPY_SAFE_MAX (or
+# Python ints too big for int64) fall back to the exact scalar version.
+# That fallback uses the original Python values, not the array: a list
+# mixing -1 and 2**63 becomes float64 in NumPy and would be rounded.
+# A NaN count builds no layer (height 0), like the loops below.
+# NumPy input returns a NumPy array, any other iterable returns a list.
+
+_NUMPY_SAFE_MAX = 2 ** 60  # keeps (h + 1) * (h + 2) inside int64
+
+
+def _exact_height(blocks):
+    if blocks != blocks:  # NaN
+        return 0
+    return pyramid_height(int(blocks))
+
 
-blocks = int(input("Enter the number of blocks (while loop): "))
+def pyramid_heights(counts):
+    if np is None:
+        return [pyramid_height(blocks) for blocks in counts]
 
-height = 0
-current_layer_blocks = 1
+    as_array = isinstance(counts, np.ndarray)
+    if not as_array:
+        counts = list(counts)
+    values = np.asarray(counts)
 
-while blocks >= current_layer_blocks:
-    blocks -= current_layer_blocks
-    current_layer_blocks += 1  # manual step to grow the next layer size
-    height += 1
+    if values.size == 0:
+        heights = np.zeros(values.shape, dtype=np.int64)
+        return heights if as_array else []
+
+    if values.dtype.kind not in "iu" or values.max() > _NUMPY_SAFE_MAX:
+        if not as_array:
+            return [_exact_height(blocks) for blocks in counts]
+        heights = [_exact_height(blocks) for blocks in values.ravel()]
+        return np.array(heights, dtype=object).reshape(values.shape)
+
+    blocks = np.maximum(values.astype(np.int64), 0)
+    heights = ((np.sqrt(8.0 * blocks + 1.0) - 1.0) // 2).astype(np.int64)
+    heights -= heights * (heights + 1) // 2 > blocks         # guess too high
+    heights += (heights + 1) * (heights + 2) // 2 <= blocks  # guess too low
+
+    return heights if as_array else heights.tolist()
+
+
+print("Pyramid height (closed form, 6 blocks):", pyramid_height(6))  # 3
+print("Pyramid heights (batch):", pyramid_heights([0, 1, 2, 3, 10, 10**30]))
+# [0, 1, 1, 2, 4, 1414213562373094]
 
-print("Pyramid height (while loop):", height)
 
 # ------------------------------------------------------------
-# FOR-LOOP VARIANT
+# INTERACTIVE LOOP SOLUTIONS
 # ------------------------------------------------------------
-# The for-loop version still works, but needs a break
-# once blocks run out, and it uses range() to advance layer size.
+# The input() prompts only run when this file is executed directly,
+# so the solvers above can be imported without blocking on input.
+
+if __name__ == "__main__":
+    # ------------------------------------------------------------
+    # WHILE-LOOP SOLUTION
+    # ------------------------------------------------------------
+    # This version is direct because we don't know how many layers
+    # will fit. We keep subtracting until the next layer can't be built.
+
+    blocks = int(input("Enter the number of blocks (while loop): "))
+
+    height = 0
+    current_layer_blocks = 1
+
+    while blocks >= current_layer_blocks:
+        blocks -= current_layer_blocks
+        current_layer_blocks += 1  # manual step to grow the next layer size
+        height += 1
+
+    print("Pyramid height (while loop):", height)
+
+    # ------------------------------------------------------------
+    # FOR-LOOP VARIANT
+    # ------------------------------------------------------------
+    # The for-loop version still works, but needs a break
+    # once blocks run out, and it uses range() to advance layer size.
 
-blocks = int(input("Enter the number of blocks (for loop): "))
+    blocks = int(input("Enter the number of blocks (for loop): "))
 
-height = 0
+    height = 0
 
-for current_layer_blocks in range(1, blocks + 1): 
-    if blocks < current_layer_blocks:
-        break
-    blocks -= current_layer_blocks
-    height += 1
+    for current_layer_blocks in range(1, blocks + 1): 
+        if blocks < current_layer_blocks:
+            break
+        blocks -= current_layer_blocks
+        height += 1
 
-print("Pyramid height (for loop):", height)
+    print("Pyramid height (for loop):", height)
@@ -13,26 +13,362 @@
 # Solution:
 #   Use a while loop that runs until the number hits 1.
 #   Update the value using the even/odd rule and count steps.
+#
+#   Faster alternative: CollatzEngine below counts steps without
+#   printing and remembers every answer, so a trajectory stops as
+#   soon as it reaches a number that was already solved.
+#   Run with --bench to compare it against the plain loop.
+#
+#   collatz_sweep(N) finds the longest chain, the step histogram and
+#   the highest value reached over 1..N, split across CPU cores
+#   (run with --sweep N).
 # ============================================================
 
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# ------------------------------------------------------------
+# PLAIN LOOP (no printing)
+# ------------------------------------------------------------
+# Same rule as the interactive solution below, packed into a function
+# so it can be timed against the cached engine.
+
+def collatz_steps_loop(number):
+    step = 0
+    while number != 1:
+        if number % 2 == 0:
+            number //= 2
+        else:
+            number = 3 * number + 1
+        step += 1
+    return step
+
+
+# ------------------------------------------------------------
+# MEMOIZED ENGINE (array cache + dict overflow)
+# ------------------------------------------------------------
+# Every trajectory ends in a known suffix: once the value reaches a
+# number we already solved, steps(start) = path length + steps(known).
+#
+# - numbers below `limit` live in a compact array('I')
+#   (4 bytes per entry, 0 means "not solved yet", except for 1)
+# - bigger numbers (trajectories climb high) go into a dict,
+#   capped at `max_overflow` entries so a long sweep cannot eat all RAM
+#
+# Sweeping 1..N with limit > N is close to linear time, because most
+# trajectories drop below their starting value after a few steps.
+
+DEFAULT_CACHE_LIMIT = 1 << 20
+DEFAULT_MAX_OVERFLOW = 1 << 20
+
+
+class CollatzEngine:
+    def __init__(self, limit=DEFAULT_CACHE_LIMIT, max_overflow=DEFAULT_MAX_OVERFLOW):
+        if limit < 2:
+            raise ValueError("limit must be at least 2")
+        self.limit = limit
+        self.max_overflow = max_overflow
+        self.cache = array("I", bytes(4 * limit))
+        self.overflow = {}
+
+    def steps(self, number):
+        if number < 1:
+            raise ValueError("number must be a positive integer")
+
+        limit = self.limit
+        cache = self.cache
+        overflow = self.overflow
+
+        # walk forward until we hit 1 or an already solved number
+        path = []
+        while number != 1:
+            if number < limit:
+                known = cache[number]
+                if known:
+                    break
+            elif number in overflow:
+                known = overflow[number]
+                break
+            path.append(number)
+            if number % 2 == 0:
+                number //= 2
+            else:
+                number = 3 * number + 1
+        else:
+            known = 0
+
+        # walk back and store the answer for every number on the path
+        for value in reversed(path):
+            known += 1
+            if value < limit:
+                cache[value] = known
+            elif len(overflow) < self.max_overflow:
+                overflow[value] = known
+        return known
+
+    def steps_range(self, start, stop):
+        steps = self.steps
+        return array("I", (steps(n) for n in range(start, stop)))
+
+
+_default_engine = None
+
+
+def collatz_steps(number):
+    # Shared engine, created on first use.
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = CollatzEngine()
+    return _default_engine.steps(number)
+
+
+print("Steps for 27 (engine):", collatz_steps(27))  # 111
+print("Steps for 1..10 (engine):", list(CollatzEngine(16).steps_range(1, 11)))
+# [0, 1, 7, 2, 5, 8, 16, 3, 19, 6]
+
+
+# ------------------------------------------------------------
+# BENCHMARK: plain loop vs engine over 1..N
+# ------------------------------------------------------------
+# Both versions compute the step count of every number in 1..N.
+# The plain loop at N = 10**7 takes several minutes, which is the point.
+
+def benchmark(sizes=(10**6, 10**7)):
+    for size in sizes:
+        start = time.perf_counter()
+        loop_total = sum(collatz_steps_loop(n) for n in range(1, size + 1))
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine = CollatzEngine(size + 1)
+        engine_total = sum(engine.steps_range(1, size + 1))
+        engine_time = time.perf_counter() - start
+
+        assert loop_total == engine_total
+        print(f"N = {size:>10,}: loop {loop_time:8.2f} s, "
+              f"engine {engine_time:8.2f} s, "
+              f"speedup x{loop_time / engine_time:.1f}")
+
+
+# ------------------------------------------------------------
+# RANGE SWEEP ON SEVERAL CORES
+# ------------------------------------------------------------
+# 1..N is cut into shards, and each shard runs in its own process
+# with its own caches (see below). There are more shards than workers, so a
+# slow shard does not leave the other cores idle.
+#
+# Workers do not send lists back. Each shard owns a fixed slot of
+# 64-bit integers in one shared memory block:
+#   [best_n, best_steps, peak_low, peak_high, peak_n, histogram...]
+# The parent reads all slots and merges them once every shard is done.
+#
+# Peak: every value on a trajectory is visited once by the engine
+# (cached suffixes were already visited), so the largest value seen
+# in a shard is the highest point of any trajectory started there.
+# It is stored as two 64-bit halves because peaks can pass 2**64.
+
+# Shard walk: a shard far from 1 (say starts around 5 * 10**8) spends
+# almost all its time walking each trajectory down to a known value,
+# so the walk is made cheaper and the caches are placed where the
+# shard can use them:
+#   - only odd values are visited: from odd x, y = 3x + 1 and all the
+#     trailing zero bits of y are stripped at once (x = y >> tz is
+#     1 + tz steps). That is about a third of the loop iterations,
+#     and the peak of a trajectory is always one of those y values
+#   - caches hold odd values only, so the same memory covers twice the
+#     numbers: a small table for x < _LOW_CACHE_LIMIT (every trajectory
+#     ends there), a window for [window_low, stop) indexed relative to
+#     the shard (the shard plus up to as much again below it), and a
+#     dict for the rest, cleared when full so it keeps the suffixes
+#     of the most recent starts instead of freezing on the first ones
+# collatz_sweep() keeps shards at most _SHARD_CACHE_LIMIT wide, so the
+# window always covers its own shard.
+
+HISTOGRAM_BINS = 2048      # step counts >= 2047 share the last bin
+_SLOT_HEADER = 5
+_SLOT_SIZE = _SLOT_HEADER + HISTOGRAM_BINS
+_WORD = 8                  # bytes per slot entry ('Q')
+_LOW_CACHE_LIMIT = 1 << 21
+_SHARD_CACHE_LIMIT = 1 << 24  # window entries, each one odd number
+
+
+def _sweep_into(slot, start, stop):
+    low_limit = min(stop, _LOW_CACHE_LIMIT)
+    low_cache = array("I", bytes(4 * (low_limit // 2 + 1)))  # odd x at x >> 1
+    window_low = max(low_limit, start // 2, stop - 2 * _SHARD_CACHE_LIMIT) | 1
+    window = array("I", bytes(4 * max((stop - window_low + 1) // 2, 0)))
+    overflow = {}
+
+    best_n, best_steps = start, -1
+    peak, peak_n = start, start
+    last_bin = HISTOGRAM_BINS - 1
+
+    for n in range(start, stop):
+        number, even_steps = n, 0
+        if not number & 1:
+            even_steps = (number & -number).bit_length() - 1
+            number >>= even_steps
+
+        path = []  # (odd value, steps from it to the next odd value)
+        while number != 1:
+            if number < low_limit:
+                known = low_cache[number >> 1]
+                if known:
+                    break
+            elif window_low <= number < stop:
+                known = window[(number - window_low) >> 1]
+                if known:
+                    break
+            elif number in overflow:
+                known = overflow[number]
+                break
+            up = 3 * number + 1
+            if up > peak:
+                peak, peak_n = up, n
+            zeros = (up & -up).bit_length() - 1
+            path.append((number, zeros + 1))
+            number = up >> zeros
+        else:
+            known = 0
+
+        for value, steps in reversed(path):
+            known += steps
+            if value < low_limit:
+                low_cache[value >> 1] = known
+            elif window_low <= value < stop:
+                window[(value - window_low) >> 1] = known
+            else:
+                if len(overflow) >= DEFAULT_MAX_OVERFLOW:
+                    overflow.clear()
+                overflow[value] = known
+        known += even_steps
+
+        if known > best_steps:
+            best_n, best_steps = n, known
+        slot[_SLOT_HEADER + min(known, last_bin)] += 1
+
+    slot[0] = best_n
+    slot[1] = best_steps
+    slot[2] = peak & 0xFFFFFFFFFFFFFFFF
+    slot[3] = peak >> 64
+    slot[4] = peak_n
+
+
+def _sweep_shard(shm_name, index, start, stop):
+    # Worker entry point: attach to the shared block and fill one slot.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        words = shm.buf.cast("Q")
+        try:
+            _sweep_into(words[index * _SLOT_SIZE:(index + 1) * _SLOT_SIZE], start, stop)
+        finally:
+            words.release()
+    finally:
+        shm.close()
+    return index
+
+
+def _merge_slots(words, shard_count):
+    longest = (0, -1)
+    peak = (0, 0)
+    histogram = [0] * HISTOGRAM_BINS
+
+    for index in range(shard_count):
+        base = index * _SLOT_SIZE
+        best_n, best_steps = words[base], words[base + 1]
+        if best_steps > longest[1] or (best_steps == longest[1] and best_n < longest[0]):
+            longest = (best_n, best_steps)
+
+        value = words[base + 2] | (words[base + 3] << 64)
+        if value > peak[0] or (value == peak[0] and words[base + 4] < peak[1]):
+            peak = (value, words[base + 4])
+
+        for steps in range(HISTOGRAM_BINS):
+            histogram[steps] += words[base + _SLOT_HEADER + steps]
+
+    while histogram and histogram[-1] == 0:
+        histogram.pop()
+
+    return {
+        "longest": longest,      # (start, steps), smallest start on ties
+        "peak": peak,            # (highest value reached, its start)
+        "histogram": histogram,  # histogram[steps] = how many starts
+    }
+
+
+def collatz_sweep(limit, workers=None, shards_per_worker=4):
+    # Sweep 1..limit (inclusive).
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    workers = workers or os.cpu_count() or 1
+
+    shard_count = min(limit, max(workers * shards_per_worker,
+                                 -(-limit // _SHARD_CACHE_LIMIT)))
+    step = -(-limit // shard_count)  # ceiling division
+    bounds = [(start, min(start + step, limit + 1))
+              for start in range(1, limit + 1, step)]
+    shard_count = len(bounds)
+
+    if workers == 1:
+        words = array("Q", bytes(_WORD * _SLOT_SIZE * shard_count))
+        for index, (start, stop) in enumerate(bounds):
+            _sweep_into(memoryview(words)[index * _SLOT_SIZE:(index + 1) * _SLOT_SIZE],
+                        start, stop)
+        return _merge_slots(words, shard_count)
+
+    shm = shared_memory.SharedMemory(create=True, size=_WORD * _SLOT_SIZE * shard_count)
+    try:
+        shm.buf[:] = bytes(shm.size)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sweep_shard, shm.name, index, start, stop)
+                       for index, (start, stop) in enumerate(bounds)]
+            for future in futures:
+                future.result()  # re-raise any worker error
+
+        words = shm.buf.cast("Q")
+        try:
+            return _merge_slots(words, shard_count)
+        finally:
+            words.release()
+    finally:
+        shm.close()
+        shm.unlink()
+
 
 # ------------------------------------------------------------
 # WHILE-LOOP SOLUTION
 # ------------------------------------------------------------
 # The loop continues until the value reaches 1, printing
 # each step so the sequence is visible.
+# It only runs when the file is executed directly (not on import);
+# pass --bench or --sweep N to run those instead.
 
-number = int(input("write a non zero positive number: "))
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark()
+elif __name__ == "__main__" and "--sweep" in sys.argv:
+    sweep_limit = int(sys.argv[sys.argv.index("--sweep") + 1])
+    result = collatz_sweep(sweep_limit)
+    print("Longest chain (start, steps):", result["longest"])
+    print("Highest value (value, start):", result["peak"])
+    print("Most common step count:", max(range(len(result["histogram"])),
+                                          key=result["histogram"].__getitem__))
+elif __name__ == "__main__":
+    number = int(input("write a non zero positive number: "))
 
-step = 0
+    step = 0
 
-while number != 1:
-    if number % 2 == 0:
-        number //= 2            # integer division for even numbers
-    else:
-        number = 3 * number + 1
+    while number != 1:
+        if number % 2 == 0:
+            number //= 2            # integer division for even numbers
+        else:
+            number = 3 * number + 1
 
-    step += 1
-    print(step, number)
+        step += 1
+        print(step, number)
 
-print("Done in", step, "steps.")
+    print("Done in", step, "steps.")
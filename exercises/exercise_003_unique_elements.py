@@ -47,3 +47,341 @@ from collections import OrderedDict
 unique_ordered_alt = list(OrderedDict.fromkeys(numbers))
 print("Unique elements with OrderedDict (order preserved):", unique_ordered_alt) 
 # [8, 1, 6, 3, 9, 2, 11]
+
+# ------------------------------------------------------------
+# Streaming solution with bounded memory (spill to disk)
+# ------------------------------------------------------------
+# All the versions above need the whole input and the whole result
+# in memory. unique_stream() is a generator: it yields each item the
+# first time it shows up, so the input can be any iterable (a file,
+# a socket, a huge generator) and the output is consumed lazily.
+#
+# How memory stays bounded:
+# - each item is reduced to a 128-bit key (16 bytes of blake2b)
+# - keys are kept in a set until `memory_keys` of them are stored
+# - then the set is sorted and written to a partition file on disk
+#   (fixed 16-byte records), and the set starts again empty
+# - lookups check the set first, then binary-search each partition
+#   through mmap, so only the touched pages are read
+# - partitions are merged by size (size-tiered, like an LSM tree):
+#   a spill is a tier-0 file; when `max_partitions` files of the same
+#   tier exist, they are merged into one sorted tier+1 file
+#   (heapq.merge) and the old files are deleted
+#
+# Merging only files of similar size means each key is rewritten once
+# per tier, about log(n / memory_keys) / log(max_partitions) times,
+# instead of on every merge. Lookups check at most
+# (max_partitions - 1) files per tier.
+#
+# Items may be int, float, str or bytes (the usual IDs), and two
+# items count as the same exactly when dict.fromkeys() would merge
+# them: the key is hashed from a canonical encoding, so 1, 1.0 and
+# True get the same key, while "1" and b"1" do not. Any other type
+# (and NaN, which is not even equal to itself) raises TypeError /
+# ValueError instead of being deduplicated by a guess.
+# With 128-bit keys the chance of any collision among n keys is about
+# n² / 2**129: ~4e-20 for 5 billion IDs.
+import bisect
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+
+DEFAULT_MEMORY_KEYS = 1_000_000
+DEFAULT_MAX_PARTITIONS = 8
+_KEY_SIZE = 16
+_WRITE_CHUNK = 1 << 16  # keys per write
+
+
+def _stream_key(item):
+    if isinstance(item, float) and item.is_integer():
+        item = int(item)  # 1.0 == 1, so it must get the key of 1
+    if isinstance(item, int):
+        data = b"i" + item.to_bytes(item.bit_length() // 8 + 1, "little", signed=True)
+    elif isinstance(item, float):
+        if item != item:
+            raise ValueError("unique_stream() cannot deduplicate NaN")
+        data = b"f" + struct.pack("<d", item)
+    elif isinstance(item, str):
+        data = b"s" + item.encode("utf-8", "surrogatepass")
+    elif isinstance(item, bytes):
+        data = b"b" + item
+    else:
+        raise TypeError("unique_stream() supports int, float, str and bytes items, "
+                        f"not {type(item).__name__}")
+    # big-endian bytes: comparing keys as bytes is comparing them as numbers
+    return hashlib.blake2b(data, digest_size=_KEY_SIZE).digest()
+
+
+class _SortedKeys:
+    # The records of a mapped partition file as a sequence, so bisect
+    # can search it and heapq.merge can read it in order.
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def __len__(self):
+        return len(self.mapped) // _KEY_SIZE
+
+    def __getitem__(self, index):
+        start = index * _KEY_SIZE
+        return self.mapped[start:start + _KEY_SIZE]
+
+    def __iter__(self):
+        mapped = self.mapped
+        for start in range(0, len(mapped), _KEY_SIZE):
+            yield mapped[start:start + _KEY_SIZE]
+
+
+def _write_partition(path, sorted_keys):
+    chunk = []
+    with open(path, "wb") as f:
+        for key in sorted_keys:
+            chunk.append(key)
+            if len(chunk) == _WRITE_CHUNK:
+                f.write(b"".join(chunk))
+                chunk.clear()
+        f.write(b"".join(chunk))
+
+
+def _open_partition(path):
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return path, mapped, _SortedKeys(mapped)
+
+
+def _close_partition(partition):
+    path, mapped, keys = partition
+    mapped.close()
+    os.remove(path)
+
+
+def _in_partition(keys, key):
+    index = bisect.bisect_left(keys, key)
+    return index < len(keys) and keys[index] == key
+
+
+def unique_stream(iterable, memory_keys=DEFAULT_MEMORY_KEYS,
+                  max_partitions=DEFAULT_MAX_PARTITIONS, spill_dir=None):
+    if memory_keys < 1 or max_partitions < 2:
+        raise ValueError("memory_keys must be >= 1 and max_partitions >= 2")
+
+    seen = set()
+    partitions = []  # oldest (biggest) first
+    tiers = []       # tiers[i] is the tier of partitions[i]
+    files_written = 0
+    with tempfile.TemporaryDirectory(dir=spill_dir) as workdir:
+        try:
+            for item in iterable:
+                key = _stream_key(item)
+                if key in seen or any(_in_partition(keys, key) for _, _, keys in partitions):
+                    continue
+                seen.add(key)
+                yield item
+
+                if len(seen) < memory_keys:
+                    continue
+
+                # spill: the in-memory keys become a new sorted partition
+                files_written += 1
+                path = os.path.join(workdir, f"part-{files_written}.bin")
+                _write_partition(path, sorted(seen))
+                seen.clear()
+                partitions.append(_open_partition(path))
+                tiers.append(0)
+
+                # the newest files have the lowest tier, so a full tier
+                # is always the last `max_partitions` entries
+                while len(tiers) >= max_partitions and \
+                        tiers[-max_partitions] == tiers[-1]:
+                    files_written += 1
+                    path = os.path.join(workdir, f"part-{files_written}.bin")
+                    group = partitions[-max_partitions:]
+                    _write_partition(path, heapq.merge(*(keys for _, _, keys in group)))
+                    for partition in group:
+                        _close_partition(partition)
+                    tier = tiers[-1] + 1
+                    del partitions[-max_partitions:], tiers[-max_partitions:]
+                    partitions.append(_open_partition(path))
+                    tiers.append(tier)
+        finally:
+            for partition in partitions:
+                _close_partition(partition)
+
+
+# Tiny memory_keys so the example really spills to disk.
+print("Unique elements with unique_stream (order preserved):",
+      list(unique_stream(iter(numbers), memory_keys=2, max_partitions=2)))
+# [8, 1, 6, 3, 9, 2, 11]
+
+# ------------------------------------------------------------
+# Approximate solution with a Bloom filter (order preserved)
+# ------------------------------------------------------------
+# When dropping a few unique items by mistake is acceptable, a Bloom
+# filter replaces the set. It is a plain bit array:
+# - each item sets k bits, picked by hashing its repr
+# - an item whose k bits are all set already is treated as "seen"
+#
+# A Bloom filter never lets a duplicate through, but with probability
+# ~error_rate it drops an item that was new (a false positive).
+# For `capacity` items and a target error rate p, the classic sizes are:
+#   bits    m = -capacity * ln(p) / ln(2)**2   (~9.6 bits per item at 1%)
+#   hashes  k = (m / capacity) * ln(2)
+# The filter uses a fixed m bits no matter what the items are, versus
+# roughly 100 bytes per entry for a Python set.
+# Going past `capacity` items still works, but the error rate rises.
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1")
+        self.bit_count = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: k positions from two 64-bit halves of one digest.
+        digest = hashlib.blake2b(repr(item).encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        bit_count = self.bit_count
+        return [(first + i * second) % bit_count for i in range(self.hash_count)]
+
+    def add(self, item):
+        # Set the item's bits; return True if they were all set already.
+        bits = self.bits
+        seen = True
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                seen = False
+                bits[byte] |= mask
+        return seen
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+def unique_approx(iterable, capacity, error_rate=0.01):
+    seen = BloomFilter(capacity, error_rate)
+    for item in iterable:
+        if not seen.add(item):
+            yield item
+
+
+bloom_demo = BloomFilter(capacity=1_000_000, error_rate=0.01)
+print("Bloom filter for 1,000,000 items at 1%:",
+      len(bloom_demo.bits) // 1024, "KiB,", bloom_demo.hash_count, "hashes")
+# 1170 KiB, 7 hashes
+print("Unique elements with a Bloom filter (approximate, order preserved):",
+      list(unique_approx(numbers, capacity=100)))
+# [8, 1, 6, 3, 9, 2, 11]
+
+# ------------------------------------------------------------
+# Benchmark: which of the four classic versions to pick?
+# ------------------------------------------------------------
+# Runs the four versions from the top of this file over a grid of
+#   - input sizes
+#   - duplicate ratios (0.9 = 90% of the items are repeats)
+#   - element types (small ints, strings, tuples)
+# and records the best wall time (time.perf_counter, several repeats)
+# and the peak memory (tracemalloc, in a separate run because tracing
+# slows the code down). Inputs come from a seeded random.Random, so
+# two runs with the same seed compare the same data.
+# The O(n²) "not in" loop is skipped above `max_quadratic_size`.
+#
+# Run:  python exercise_003_unique_elements.py --bench results.json
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+
+def dedup_not_in(values):
+    new_list = []
+    for value in values:
+        if value not in new_list:
+            new_list.append(value)
+    return new_list
+
+
+DEDUP_STRATEGIES = {
+    "list_not_in": dedup_not_in,
+    "set": set,
+    "dict_fromkeys": lambda values: list(dict.fromkeys(values)),
+    "ordereddict_fromkeys": lambda values: list(OrderedDict.fromkeys(values)),
+}
+
+ELEMENT_TYPES = {
+    "int": lambda i: i,
+    "str": lambda i: f"user-{i:010d}",
+    "tuple": lambda i: (i, i % 7),
+}
+
+
+def make_dedup_input(size, duplicate_ratio, element_type, seed=0):
+    rng = random.Random(seed)
+    make = ELEMENT_TYPES[element_type]
+    distinct = max(1, round(size * (1 - duplicate_ratio)))
+    values = [make(i) for i in range(distinct)]
+    values += rng.choices(values, k=size - distinct)
+    rng.shuffle(values)
+    return values
+
+
+def benchmark_dedup(sizes=(1_000, 10_000, 100_000, 1_000_000),
+                    duplicate_ratios=(0.0, 0.5, 0.9, 0.99),
+                    element_types=("int", "str", "tuple"),
+                    repeats=3, max_quadratic_size=10_000, seed=0, output=None):
+    results = []
+    for element_type in element_types:
+        for size in sizes:
+            for ratio in duplicate_ratios:
+                values = make_dedup_input(size, ratio, element_type, seed)
+                for name, strategy in DEDUP_STRATEGIES.items():
+                    row = {"strategy": name, "element_type": element_type,
+                           "size": size, "duplicate_ratio": ratio}
+                    if name == "list_not_in" and size > max_quadratic_size:
+                        row["skipped"] = True
+                        results.append(row)
+                        continue
+
+                    best = float("inf")
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        strategy(values)
+                        best = min(best, time.perf_counter() - start)
+
+                    tracemalloc.start()
+                    strategy(values)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    row["seconds"] = best
+                    row["peak_bytes"] = peak
+                    results.append(row)
+                    print(f"{element_type:>5} n={size:>9,} dup={ratio:<4} "
+                          f"{name:<21} {best * 1000:10.3f} ms {peak / 1024:10.1f} KiB")
+
+    report = {
+        "python": sys.version,
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeats": repeats,
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    return report
+
+
+if __name__ == "__main__" and "--bench" in sys.argv:
+    bench_args = sys.argv[sys.argv.index("--bench") + 1:]
+    benchmark_dedup(output=bench_args[0] if bench_args else "dedup_benchmark.json")
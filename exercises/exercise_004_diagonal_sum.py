@@ -10,6 +10,8 @@
 #   Add two versions:
 #   1) With list comprehension
 #   2) Without list comprehension
+#   3) Flat array storage and lazy pattern grids (large grids)
+#   4) Grids kept on disk and read through mmap (larger than RAM)
 #
 # Note:
 #   The outer loop (row_index) does not change the values inside each row.
@@ -66,3 +68,255 @@ print("Main diagonal sum:", diag_sum)
 #   [4, 3, 2, 1],
 # ]
 # Expected diagonal: 4 + 3 + 2 + 1 = 10
+
+# ------------------------------------------------------------
+# Version 3: flat array storage + lazy pattern grids
+# ------------------------------------------------------------
+# A list of lists stores every cell as a separate Python object
+# (about 32 bytes each plus list overhead). Matrix keeps all cells
+# in one flat array, row after row (row-major):
+#   cell (r, c) lives at index r * cols + c
+# so moving one row down is a step of `cols`, one column right is 1.
+#
+# Diagonal k (k > 0 above the main one, k < 0 below) starts at
+# (0, k) or (-k, 0) and moves by cols + 1 each step. A strided
+# memoryview slice gives it as a view: no copy, O(n) to sum.
+# The anti-diagonal starts at (0, cols - 1) and moves by cols - 1.
+#
+# PatternGrid has the same reductions but never stores any cell:
+# the value of (r, c) comes from a function, like cols - c above.
+# trace() on a 50,000 x 50,000 pattern only calls it 50,000 times.
+from array import array
+
+
+def _diagonal_span(rows, cols, k):
+    # (first row, first col, length) of diagonal k
+    row, col = (0, k) if k >= 0 else (-k, 0)
+    return row, col, max(0, min(rows - row, cols - col))
+
+
+class Matrix:
+    def __init__(self, rows, cols, typecode="q", data=None):
+        if data is None:
+            data = array(typecode, bytes(array(typecode).itemsize * rows * cols))
+        if len(data) != rows * cols:
+            raise ValueError("data must hold exactly rows * cols values")
+        self.rows = rows
+        self.cols = cols
+        self.data = data
+
+    @classmethod
+    def from_rows(cls, grid, typecode="q"):
+        rows, cols = len(grid), len(grid[0]) if grid else 0
+        data = array(typecode)
+        for row in grid:
+            if len(row) != cols:
+                raise ValueError("all rows must have the same length")
+            data.extend(row)
+        return cls(rows, cols, typecode, data)
+
+    @classmethod
+    def from_function(cls, rows, cols, func, typecode="q"):
+        data = array(typecode, (func(r, c) for r in range(rows) for c in range(cols)))
+        return cls(rows, cols, typecode, data)
+
+    def __getitem__(self, position):
+        r, c = position
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError("matrix index out of range")
+        return self.data[r * self.cols + c]
+
+    def __setitem__(self, position, value):
+        r, c = position
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError("matrix index out of range")
+        self.data[r * self.cols + c] = value
+
+    def row(self, r):
+        return memoryview(self.data)[r * self.cols:(r + 1) * self.cols]
+
+    def diagonal(self, k=0):
+        row, col, length = _diagonal_span(self.rows, self.cols, k)
+        if length == 0:
+            return memoryview(self.data)[0:0]
+        start = row * self.cols + col
+        step = self.cols + 1
+        return memoryview(self.data)[start:start + (length - 1) * step + 1:step]
+
+    def anti_diagonal(self):
+        length = min(self.rows, self.cols)
+        if self.cols == 1:  # a step of 0 is not allowed, and there is one cell
+            return memoryview(self.data)[0:length]
+        start = self.cols - 1
+        step = self.cols - 1
+        return memoryview(self.data)[start:start + (length - 1) * step + 1:step]
+
+    def trace(self):
+        return sum(self.diagonal())
+
+    def anti_trace(self):
+        return sum(self.anti_diagonal())
+
+    def band_sum(self, lower, upper):
+        # cells with -lower <= c - r <= upper: one contiguous run per row
+        view, cols, total = memoryview(self.data), self.cols, 0
+        for r in range(self.rows):
+            first, stop = max(0, r - lower), min(cols, r + upper + 1)
+            if first < stop:
+                total += sum(view[r * cols + first:r * cols + stop])
+        return total
+
+    def block_sum(self, row_start, row_stop, col_start, col_stop):
+        view, cols, total = memoryview(self.data), self.cols, 0
+        for r in range(row_start, row_stop):
+            total += sum(view[r * cols + col_start:r * cols + col_stop])
+        return total
+
+    def tolist(self):
+        return [self.row(r).tolist() for r in range(self.rows)]
+
+
+class PatternGrid:
+    def __init__(self, rows, cols, func):
+        self.rows = rows
+        self.cols = cols
+        self.func = func
+
+    def __getitem__(self, position):
+        r, c = position
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError("grid index out of range")
+        return self.func(r, c)
+
+    def diagonal(self, k=0):
+        row, col, length = _diagonal_span(self.rows, self.cols, k)
+        func = self.func
+        return (func(row + i, col + i) for i in range(length))
+
+    def anti_diagonal(self):
+        func, last_col = self.func, self.cols - 1
+        return (func(i, last_col - i) for i in range(min(self.rows, self.cols)))
+
+    def trace(self):
+        return sum(self.diagonal())
+
+    def anti_trace(self):
+        return sum(self.anti_diagonal())
+
+    def materialize(self, typecode="q"):
+        return Matrix.from_function(self.rows, self.cols, self.func, typecode)
+
+
+rows = 4
+cols = 4
+
+pattern = PatternGrid(rows, cols, lambda r, c: cols - c)
+matrix = pattern.materialize()
+
+print("Matrix (flat array):", matrix.tolist())
+print("Main diagonal sum:", matrix.trace())            # 10
+print("Anti-diagonal sum:", matrix.anti_trace())       # 1 + 2 + 3 + 4 = 10
+print("Diagonal k=1:", matrix.diagonal(1).tolist())    # [3, 2, 1]
+print("Pattern trace (no cells stored):", pattern.trace())  # 10
+
+big = PatternGrid(50_000, 50_000, lambda r, c: 50_000 - c)
+print("Pattern trace 50,000 x 50,000:", big.trace())   # 1250025000
+
+
+# ------------------------------------------------------------
+# Version 4: grids on disk (mmap), bigger than RAM
+# ------------------------------------------------------------
+# A grid saved as raw values (row after row, no header) can be
+# opened with mmap instead of being read. The operating system
+# loads a page (usually 4 KiB) only when a cell in it is touched.
+#
+# MappedMatrix is a Matrix whose flat data is a memoryview over the
+# mapped file, so every reduction above works unchanged:
+# - trace()/diagonal(k): one cell per row, so one page per row
+# - band_sum(): one short run per row
+# - block_sum(): only the rows and columns of the block
+#
+# parallel_trace() cuts the diagonal into chunks and sums them on a
+# thread pool. With NumPy, each chunk is summed by NumPy, which
+# releases the GIL, so page faults and additions overlap across
+# threads. Without NumPy the threads still give the right answer,
+# but the GIL runs them one at a time.
+# NumPy adds int64 values with wraparound, so a chunk whose values
+# could overflow (largest |value| * chunk length >= 2**63) is summed
+# as Python ints instead: both paths give the same exact result.
+#
+# Close the MappedMatrix (or use "with") once you are done, and drop
+# any diagonal()/row() views first: a mapping with live views cannot
+# be closed.
+import mmap
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np  # optional, only used by parallel_trace()
+except ImportError:
+    np = None
+
+
+def save_matrix(path, matrix):
+    with open(path, "wb") as f:
+        f.write(memoryview(matrix.data).cast("B"))
+
+
+class MappedMatrix(Matrix):
+    def __init__(self, path, rows, cols, typecode="q", writable=False):
+        with open(path, "r+b" if writable else "rb") as f:
+            expected = rows * cols * array(typecode).itemsize
+            if os.fstat(f.fileno()).st_size != expected:
+                raise ValueError(f"{path} must hold exactly rows * cols values "
+                                 f"({expected} bytes)")
+            self._mmap = mmap.mmap(f.fileno(), 0,
+                                   access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        super().__init__(rows, cols, typecode, memoryview(self._mmap).cast(typecode))
+
+    def close(self):
+        self.data.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parallel_trace(matrix, k=0, workers=None, chunk=1 << 16):
+    diagonal = matrix.diagonal(k)
+    if np is not None:
+        diagonal = np.asarray(diagonal)  # zero-copy strided view
+
+    def chunk_sum(start):
+        part = diagonal[start:start + chunk]
+        if np is None:
+            return sum(part)
+        if part.dtype.kind in "iu":
+            biggest = max(abs(int(part.min())), abs(int(part.max())))
+            if biggest * len(part) >= 2 ** 63:
+                return sum(part.tolist())  # would overflow int64
+        return part.sum().item()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        total = sum(pool.map(chunk_sum, range(0, len(diagonal), chunk)))
+    if np is None:
+        diagonal.release()
+    return total
+
+
+rows = 300
+cols = 300
+
+with tempfile.TemporaryDirectory() as folder:
+    grid_path = os.path.join(folder, "grid.bin")
+    save_matrix(grid_path, PatternGrid(rows, cols, lambda r, c: cols - c).materialize())
+
+    with MappedMatrix(grid_path, rows, cols) as on_disk:
+        print("Mapped trace:", on_disk.trace())                            # 45150
+        print("Mapped band sum (|c - r| <= 1):", on_disk.band_sum(1, 1))   # 135149
+        print("Mapped block sum (2 x 2 corner):", on_disk.block_sum(0, 2, 0, 2))  # 1198
+        print("Parallel trace:", parallel_trace(on_disk, workers=4, chunk=64))    # 45150
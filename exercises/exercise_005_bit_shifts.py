@@ -51,3 +51,103 @@ for n in nums:
     print("n:", n, "n<<1:", shifted, "n*2:", doubled)
     # Bits view (8-bit) to visualize the shift
     print("bits:", bin(n)[2:].rjust(8, "0"), "->", bin(shifted)[2:].rjust(8, "0"))
+
+
+print("# ------------------------------------------------------------")
+print("# Bulk version: millions of values to bit strings")
+print("# Byte lookup tables, output built in one bytearray.")
+print("# ------------------------------------------------------------")
+
+# Formatting one value at a time (f"{val:08b}" + print) costs a
+# Python call and a str per value. The bulk version works per chunk:
+#   1. pack the chunk into an array of unsigned ints, big-endian,
+#      so the bytes come out most significant first
+#   2. BIT_TABLES[k] is a 256-entry table: byte -> b"0" or b"1" for
+#      bit k of that byte. bytes.translate() applies it to the whole
+#      chunk in C, with no Python loop per value
+#   3. each translated column is copied into a preallocated bytearray
+#      with one strided slice, then b"\n" goes after every value
+# The bytearray is reused for every chunk and written to the file in
+# one call, so output goes out in large blocks.
+#
+# Only the lowest `width` bits of each value are shown (like a
+# register dump). Values that do not fit the packing type (bigger
+# ones, or negative ones) are masked with (1 << width) - 1 first, so
+# a negative value shows as two's complement.
+import sys
+from array import array
+from itertools import islice
+
+# BIT_TABLES[k][byte] is ord("0") or ord("1"): bit k, counted from the left
+BIT_TABLES = [bytes(48 + ((byte >> (7 - k)) & 1) for byte in range(256))
+              for k in range(8)]
+
+
+def _packing_typecode(width):
+    for typecode in "BHILQ":
+        if array(typecode).itemsize * 8 >= width:
+            return typecode
+    raise ValueError("width must be between 1 and 64")
+
+
+def _render_bits(values, width, out):
+    # Render `values` into `out`; return how many bytes were used.
+    typecode = _packing_typecode(width)
+    try:
+        packed = array(typecode, values)
+    except OverflowError:
+        mask = (1 << width) - 1
+        packed = array(typecode, [value & mask for value in values])
+    if sys.byteorder == "little":
+        packed.byteswap()
+    data = packed.tobytes()
+
+    count = len(packed)
+    line = width + 1
+    item_size = packed.itemsize
+    skip = item_size * 8 - width  # leading bits that are not shown
+    used = count * line
+    for k in range(8):
+        bits = None
+        for byte_index in range(item_size):
+            column = byte_index * 8 + k - skip
+            if column < 0:
+                continue
+            if bits is None:
+                bits = data.translate(BIT_TABLES[k])
+            out[column:used:line] = bits[byte_index::item_size]
+    out[width:used:line] = b"\n" * count
+    return used
+
+
+def format_bits(values, width=8):
+    if not 1 <= width <= 64:
+        raise ValueError("width must be between 1 and 64")
+    values = list(values)
+    out = bytearray(len(values) * (width + 1))
+    _render_bits(values, width, out)
+    return out
+
+
+def write_bits(values, file, width=8, chunk_size=1 << 16):
+    # Stream one bit string per line to a binary file; return the count.
+    if not 1 <= width <= 64:
+        raise ValueError("width must be between 1 and 64")
+    out = bytearray(chunk_size * (width + 1))
+    view = memoryview(out)
+    values = iter(values)
+    total = 0
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            break
+        file.write(view[:_render_bits(chunk, width, out)])
+        total += len(chunk)
+    return total
+
+
+print(format_bits([1, 2, 4, 8], width=4).decode("ascii"), end="")
+# 0001
+# 0010
+# 0100
+# 1000
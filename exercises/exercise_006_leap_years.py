@@ -25,6 +25,7 @@
 # Add two examples:
 #   1) A clear step-by-step function
 #   2) A shorter version using list comprehension
+#   3) Array checks and O(1) leap-year counts for large data
 # ============================================================
 
 print("\n# -----------------------------")
@@ -57,4 +58,55 @@ leap_years = [y for y in years if is_leap(y)]
 
 print("Years:", years)
 print("Leap years:", leap_years)
-# Expected: [1992, 1996, 2000, 2004]
\ No newline at end of file
+# Expected: [1992, 1996, 2000, 2004]
+
+
+print("\n# -----------------------------")
+print("# 3. Example 3: many years at once (arrays and the 400-year cycle)")
+print("# -----------------------------\n")
+
+# is_leap_mask(): the same rule as is_leap(), applied to a whole NumPy
+# array in one expression, so the loop runs in C instead of Python.
+# Without NumPy it falls back to a plain list of booleans.
+#
+# count_leap_years(a, b): how many leap years are in [a, b).
+# The Gregorian rules repeat every 400 years (97 leap years per
+# cycle), so a 401-entry table of "leap years before year y of the
+# cycle" answers any range with two lookups, no matter how wide.
+# Python's % floors, so negative (proleptic) years work too.
+
+try:
+    import numpy as np  # optional, only used by is_leap_mask()
+except ImportError:
+    np = None
+
+LEAP_YEARS_PER_CYCLE = 97
+
+# LEAPS_BEFORE[y] = leap years in [0, y) for 0 <= y <= 400
+LEAPS_BEFORE = [0]
+for cycle_year in range(400):
+    LEAPS_BEFORE.append(LEAPS_BEFORE[-1] + is_leap(cycle_year))
+
+
+def is_leap_mask(years):
+    if np is None:
+        return [is_leap(year) for year in years]
+    years = np.asarray(years)
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def _leaps_before(year):
+    cycles, rest = divmod(year, 400)
+    return cycles * LEAP_YEARS_PER_CYCLE + LEAPS_BEFORE[rest]
+
+
+def count_leap_years(start, stop):
+    if stop <= start:
+        return 0
+    return _leaps_before(stop) - _leaps_before(start)
+
+
+print("Leap mask 1990-1999:", list(map(bool, is_leap_mask(range(1990, 2000)))))
+print("Leap years in [1990, 2035):", count_leap_years(1990, 2035))  # 11
+print("Leap years in [1, 1_000_000_001):", count_leap_years(1, 1_000_000_001))
+# 242500000
@@ -6,9 +6,21 @@
 # Exercise:
 #   Calculate the number of days in a month for several test cases.
 #   Reuse the leap-year function from exercise_006_leap_years.py.
+#
+#   day_of_year() uses precomputed cumulative month tables, so it is
+#   one lookup instead of a loop over the previous months. The inverse
+#   (day of year -> month/day) and batch versions for NumPy columns
+#   are at the end.
 # ============================================================
 
-from exercise_006_leap_years import is_leap_year  # run this file from the exercises folder
+from bisect import bisect_left
+
+from exercise_006_leap_years import is_leap_year, is_leap_mask  # run this file from the exercises folder
+
+try:
+    import numpy as np  # optional, only used by the batch functions
+except ImportError:
+    np = None
 
 
 print("\n# -----------------------------")
@@ -52,23 +64,101 @@ print("\n# -----------------------------")
 print("# Day of year (function)")
 print("# -----------------------------\n")
 
+# Cumulative month tables: CUMULATIVE_DAYS[leap][m] is the number of
+# days before month m + 1, so month m covers the days
+# CUMULATIVE_DAYS[leap][m - 1] + 1 ... CUMULATIVE_DAYS[leap][m].
+# Index with is_leap_year(year): False -> 0 (common), True -> 1 (leap).
+CUMULATIVE_DAYS = []
+for leap_year in (1999, 2000):
+    table = [0]
+    for m in range(1, 13):
+        table.append(table[-1] + days_in_month(leap_year, m))
+    CUMULATIVE_DAYS.append(table)
+
+# COMMON: [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365]
+# LEAP:   [0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335, 366]
+
+
 # Calculate the day of the year given year, month, day.
 def day_of_year(year, month, day):
     # validate month
     if month < 1 or month > 12:
         return None
 
-    # validate day
-    if day < 1 or day > days_in_month(year, month):
+    table = CUMULATIVE_DAYS[is_leap_year(year)]
+
+    # validate day (the month length is the gap between two entries)
+    if day < 1 or day > table[month] - table[month - 1]:
         return None
 
-    # sum days in previous months, then add the current day
-    total = 0
-    for m in range(1, month):
-        total += days_in_month(year, m)
-    return total + day
+    # days in previous months come straight from the table
+    return table[month - 1] + day
 
 print(day_of_year(2000, 1, 30)) # 30
 print(day_of_year(2000, 4, 29))  # 120
 print(day_of_year(2001, 16, 1))  # None (invalid month)
 print(day_of_year(2001, 10, 32))  # None (invalid day)
+
+
+print("\n# -----------------------------")
+print("# Day of year -> month and day (inverse)")
+print("# -----------------------------\n")
+
+# bisect_left finds the first month whose cumulative total reaches the
+# ordinal: table[month - 1] < ordinal <= table[month].
+def month_day_from_ordinal(year, ordinal):
+    table = CUMULATIVE_DAYS[is_leap_year(year)]
+    if ordinal < 1 or ordinal > table[12]:
+        return None
+    month = bisect_left(table, ordinal)
+    return month, ordinal - table[month - 1]
+
+print(month_day_from_ordinal(2000, 120))  # (4, 29)
+print(month_day_from_ordinal(2001, 60))   # (3, 1)
+print(month_day_from_ordinal(2001, 366))  # None (2001 has 365 days)
+
+
+print("\n# -----------------------------")
+print("# Whole columns at once (batch)")
+print("# -----------------------------\n")
+
+# The same lookups on NumPy arrays: one fancy-index into a (2, 13)
+# table replaces the Python call per row. Invalid rows give 0 instead
+# of None, because an integer array cannot hold None.
+# Without NumPy both functions fall back to plain lists.
+
+def day_of_year_batch(years, months, days):
+    if np is None:
+        return [day_of_year(y, m, d) or 0 for y, m, d in zip(years, months, days)]
+
+    years, months, days = np.asarray(years), np.asarray(months), np.asarray(days)
+    table = np.array(CUMULATIVE_DAYS)
+    leap = is_leap_mask(years).astype(np.intp)
+
+    valid = (months >= 1) & (months <= 12)
+    safe_months = np.where(valid, months, 1)
+    before = table[leap, safe_months - 1]
+    valid &= (days >= 1) & (days <= table[leap, safe_months] - before)
+    return np.where(valid, before + days, 0)
+
+
+def month_day_batch(years, ordinals):
+    if np is None:
+        pairs = [month_day_from_ordinal(y, o) or (0, 0) for y, o in zip(years, ordinals)]
+        return [m for m, _ in pairs], [d for _, d in pairs]
+
+    years, ordinals = np.asarray(years), np.asarray(ordinals)
+    table = np.array(CUMULATIVE_DAYS)
+    leap = is_leap_mask(years).astype(np.intp)
+
+    valid = (ordinals >= 1) & (ordinals <= table[leap, 12])
+    months = np.where(leap == 1,
+                      np.searchsorted(table[1], ordinals),
+                      np.searchsorted(table[0], ordinals))
+    months = np.where(valid, months, 0)
+    days = np.where(valid, ordinals - table[leap, np.clip(months - 1, 0, 12)], 0)
+    return months, days
+
+
+print(day_of_year_batch([2000, 2000, 2001], [1, 4, 16], [30, 29, 1]))  # [30 120 0]
+print(month_day_batch([2000, 2001], [120, 60]))  # ([4 3], [29 1])
@@ -64,3 +64,476 @@ print()  # end with a newline
 n = 5
 limit = int(n ** 0.5) 
 n % 10 == 3
+
+
+print("\n# -----------------------------")
+print("# Many primes at once (segmented sieve)")
+print("# -----------------------------\n")
+
+# Testing numbers one by one repeats the same divisions again and
+# again. The Sieve of Eratosthenes does the opposite: start with
+# "everything is prime" and cross out the multiples of each prime.
+#
+# A plain sieve up to hi needs hi bytes of memory. The segmented
+# version only keeps:
+# - the "base" primes up to sqrt(hi) (enough to cross out any
+#   composite below hi, same reason as in is_prime_sqrt)
+# - one segment of the range at a time, sized to stay in the CPU
+#   cache (SEGMENT_SIZE bytes)
+# and only odd numbers are stored (byte i <-> seg_low + 2 * i), so a
+# segment covers 2 * SEGMENT_SIZE numbers.
+# Crossing out is one slice assignment per prime per segment:
+#   segment[first::p] = bytes(count)
+# (a step of p in the odd-only index is a step of 2p in the numbers).
+import math
+from itertools import compress
+
+SEGMENT_SIZE = 1 << 18  # bytes per segment (256 KiB)
+
+
+def _odd_base_primes(limit):
+    # Odd primes <= limit, with a plain (small) sieve.
+    if limit < 3:
+        return []
+    sieve = bytearray(b"\x01") * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return list(compress(range(3, limit + 1, 2), sieve[3::2]))
+
+
+def _sieve_segments(lo, hi, segment_size=SEGMENT_SIZE):
+    # Yield (seg_low, segment) for the odd numbers in [lo, hi):
+    # segment[i] is 1 when seg_low + 2 * i is prime.
+    low = max(lo, 3) | 1
+    base_primes = _odd_base_primes(math.isqrt(max(hi - 1, 0)))
+    for seg_low in range(low, hi, 2 * segment_size):
+        seg_high = min(seg_low + 2 * segment_size, hi)
+        size = (seg_high - seg_low + 1) // 2
+        segment = bytearray(b"\x01") * size
+        for p in base_primes:
+            square = p * p
+            if square >= seg_high:
+                break
+            start = max(square, (seg_low + p - 1) // p * p)
+            if start % 2 == 0:
+                start += p
+            first = (start - seg_low) // 2
+            if first < size:
+                segment[first::p] = bytes(len(range(first, size, p)))
+        yield seg_low, segment
+
+
+def segmented_primes(lo, hi, segment_size=SEGMENT_SIZE):
+    # Generator: primes p with lo <= p < hi, in increasing order.
+    if lo <= 2 < hi:
+        yield 2
+    for seg_low, segment in _sieve_segments(lo, hi, segment_size):
+        yield from compress(range(seg_low, seg_low + 2 * len(segment), 2), segment)
+
+
+def primes_between(lo, hi):
+    return list(segmented_primes(lo, hi))
+
+
+def prime_count(n, workers=1):
+    # pi(n): how many primes are <= n (counts bytes, no list is built).
+    # workers > 1 splits the range over processes (see _shard_count below).
+    if n < 2:
+        return 0
+    if workers > 1:
+        return _parallel_count(n, workers)
+    return 1 + sum(segment.count(1) for _, segment in _sieve_segments(3, n + 1))
+
+
+def nth_prime(n):
+    # 1st prime is 2. For n >= 6 the n-th prime is below
+    # n * (ln n + ln ln n) (Rosser's theorem), so sieve up to that bound.
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    if n == 1:
+        return 2
+    bound = 15 if n < 6 else int(n * (math.log(n) + math.log(math.log(n)))) + 1
+    remaining = n - 1  # 2 is already counted
+    for seg_low, segment in _sieve_segments(3, bound):
+        found = segment.count(1)
+        if found < remaining:
+            remaining -= found
+            continue
+        for value in compress(range(seg_low, seg_low + 2 * len(segment), 2), segment):
+            remaining -= 1
+            if remaining == 0:
+                return value
+    raise AssertionError("bound for the n-th prime was too small")
+
+
+print("Primes in [1, 50):", primes_between(1, 50))
+print("Primes in [10**9, 10**9 + 100):", primes_between(10**9, 10**9 + 100))
+# prime_count() and nth_prime() examples: see the end of the file.
+
+
+print("\n# -----------------------------")
+print("# Prime check for big numbers (Miller-Rabin)")
+print("# -----------------------------\n")
+
+# is_prime_sqrt needs up to sqrt(n) divisions: ~10**9 for a 60-bit n.
+# Miller-Rabin needs a handful of modular powers instead.
+#
+# Write n - 1 = d * 2**s with d odd. For a prime n and any base a,
+# either a**d % n == 1, or squaring it repeatedly hits n - 1 within
+# s steps. A base where neither happens proves n is composite.
+# pow(a, d, n) does the modular power fast, without huge numbers.
+#
+# - deterministic: with the first 12 primes as bases the answer is
+#   exact for every n < 3.1 * 10**23 (so every 64-bit integer)
+# - probabilistic: above that, `rounds` random bases are used; a
+#   composite survives each round with probability <= 1/4
+#
+# primality_batch() first removes numbers with a small factor:
+# one gcd with the product of all primes below 1000 (a single C call)
+# rejects most composites before any pow() is done.
+import random
+
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+MR_DETERMINISTIC_LIMIT = 318_665_857_834_031_151_167_461
+SMALL_PRIMES = primes_between(2, 1000)
+SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+
+
+def _passes_miller_rabin(n, bases):
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False  # a is a witness: n is composite
+    return True
+
+
+def is_prime_mr(n, rounds=40):
+    if n < 2:
+        return False
+    for p in MR_BASES:
+        if n % p == 0:
+            return n == p
+    if n < MR_DETERMINISTIC_LIMIT:
+        return _passes_miller_rabin(n, MR_BASES)
+    return _passes_miller_rabin(n, [random.randrange(2, n - 1) for _ in range(rounds)])
+
+
+def primality_batch(numbers, rounds=40):
+    results = []
+    for n in numbers:
+        if n < 1000:
+            results.append(n in SMALL_PRIMES_SET)
+        elif math.gcd(n, SMALL_PRIMES_PRODUCT) != 1:
+            results.append(False)  # has a prime factor below 1000
+        elif n < 1_000_000:
+            results.append(True)   # no factor <= sqrt(n) < 1000
+        elif n < MR_DETERMINISTIC_LIMIT:
+            results.append(_passes_miller_rabin(n, MR_BASES))
+        else:
+            results.append(_passes_miller_rabin(
+                n, [random.randrange(2, n - 1) for _ in range(rounds)]))
+    return results
+
+
+print(is_prime_mr(2**61 - 1))                        # True (Mersenne prime)
+print(is_prime_mr(3215031751))                       # False (strong pseudoprime to 2, 3, 5, 7)
+print(primality_batch([97, 561, 10**18 + 9, 2**89 - 1]))  # [True, False, True, True]
+
+
+print("\n# -----------------------------")
+print("# Prime table saved on disk (shared by processes)")
+print("# -----------------------------\n")
+
+# Sieve once, save the result, and let every later process mmap the
+# file instead of sieving again. The operating system shares the
+# mapped pages between processes, so 100 workers use one copy.
+#
+# File format (PRIME_TABLE_MAGIC, then the limit, then the bits):
+#   bytes 0-7   b"PRIMEBIT"
+#   bytes 8-15  limit: the table covers 0 <= n < limit (little-endian)
+#   bytes 16-   one bit per odd number: bit i of the bit string <-> 2i + 1
+# Odd-only bits mean 1 byte covers 16 numbers (1e9 -> ~60 MiB).
+#
+# Packing the sieve's 0/1 bytes into bits is done in C: the bytes for
+# bit j of every output byte are segment[j::8]; translate() turns 1
+# into 1 << j, and OR-ing the 8 results as big ints packs them.
+#
+# grow(limit) only sieves the new part [old limit, new limit) and
+# writes old + new bits to a temporary file that replaces the table
+# with os.replace(), so a process still mapping the old file keeps a
+# consistent (older) copy. The old bits are copied in _COPY_CHUNK
+# pieces, so growing a 600 MiB table does not need 600 MiB of RAM.
+# NamedTemporaryFile creates the file as 0600 (owner only), so the
+# new table gets the old table's permissions, or TABLE_FILE_MODE for
+# a new one; otherwise workers running as other users could not map it.
+# Above the limit, is_prime() falls back to is_prime_mr().
+import mmap
+import os
+import struct
+import tempfile
+
+PRIME_TABLE_MAGIC = b"PRIMEBIT"
+_HEADER = struct.Struct("<8sQ")
+TABLE_FILE_MODE = 0o644  # owner writes, everyone can read (and mmap)
+_COPY_CHUNK = 1 << 24   # 16 MiB
+_BIT_SHIFT_TABLES = [bytes.maketrans(b"\x00\x01", bytes([0, 1 << j])) for j in range(8)]
+
+
+def _pack_bits(flags):
+    # 0/1 bytes (length multiple of 8) -> packed bits, bit j of byte k = flags[8k + j]
+    packed = 0
+    for j in range(8):
+        packed |= int.from_bytes(flags[j::8].translate(_BIT_SHIFT_TABLES[j]), "little")
+    return packed.to_bytes(len(flags) // 8, "little")
+
+
+class PrimeTable:
+    def __init__(self, path, limit=0):
+        self.path = path
+        self.limit = 0
+        self._mmap = None
+        self._load()
+        if self.limit < limit:
+            self.grow(limit)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, limit = _HEADER.unpack_from(self._mmap)
+        if magic != PRIME_TABLE_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a prime table file")
+        self.limit = limit
+
+    def grow(self, limit):
+        old_limit = self.limit
+        new_limit = max(16, -(-limit // 16) * 16)  # whole bytes of 16 numbers
+        if new_limit <= old_limit:
+            return
+
+        folder = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(dir=folder, delete=False) as f:
+            try:
+                f.write(_HEADER.pack(PRIME_TABLE_MAGIC, new_limit))
+                if self._mmap is not None:
+                    for start in range(_HEADER.size, len(self._mmap), _COPY_CHUNK):
+                        f.write(self._mmap[start:start + _COPY_CHUNK])
+
+                # odd numbers from old_limit + 1; 1 is not prime, the sieve starts at 3
+                pending = bytearray(b"\x00" if old_limit == 0 else b"")
+                for _, segment in _sieve_segments(old_limit, new_limit):
+                    pending += segment
+                    ready = len(pending) // 8 * 8
+                    f.write(_pack_bits(bytes(pending[:ready])))
+                    del pending[:ready]
+                f.write(_pack_bits(bytes(pending)))
+            except BaseException:
+                f.close()
+                os.remove(f.name)
+                raise
+
+        if os.path.exists(self.path):
+            os.chmod(f.name, os.stat(self.path).st_mode & 0o777)
+        else:
+            os.chmod(f.name, TABLE_FILE_MODE)
+        self.close()
+        os.replace(f.name, self.path)
+        self._load()
+
+    def is_prime(self, n):
+        if n < self.limit:
+            if n < 3:
+                return n == 2
+            if n % 2 == 0:
+                return False
+            return bool(self._mmap[_HEADER.size + (n >> 4)] >> ((n >> 1) & 7) & 1)
+        return is_prime_mr(n)
+
+    def __contains__(self, n):
+        return self.is_prime(n)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self.limit = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# PrimeTable example: see the end of the file.
+
+
+print("\n# -----------------------------")
+print("# Counting primes on several cores")
+print("# -----------------------------\n")
+
+# [2, n] is cut into contiguous shards (a few per worker, so the
+# cores stay busy until the end). Each shard is sieved in its own
+# process and sends back only a few numbers.
+#
+# prime_count(n, workers) only needs the count, so each shard returns
+# sum(segment.count(1)) — the same C-only work as the serial version.
+#
+# prime_stats(n, workers) also wants twin pairs and the biggest gap,
+# so each shard returns six numbers:
+#   (count, first prime, last prime, twin pairs inside,
+#    biggest gap inside, where that gap starts)
+# The parent adds the counts and checks the shard borders: the last
+# prime of one shard and the first prime of the next can still form
+# a twin pair or the biggest gap.
+#
+# Inside a segment (odd numbers only, 0/1 bytes) most of it is C work:
+# - twin pairs (p, p + 2) are neighbouring 1 bytes:
+#   x = int.from_bytes(segment) -> (x & (x >> 8)).bit_count()
+# - a run of z zero bytes between two primes is a gap of 2 * (z + 1):
+#   the longest run comes from segment.split(b"\x01")
+#
+# Run:  python exercise_008_prime_numbers.py --bench [n]
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _shard_bounds(n, workers, shards_per_worker):
+    stop = n + 1
+    shard_count = max(1, min(workers * shards_per_worker, stop // SEGMENT_SIZE))
+    step = -(-max(stop - 2, 1) // shard_count)
+    return [(lo, min(lo + step, stop)) for lo in range(2, stop, step)]
+
+
+def _shard_count(lo, hi):
+    count = 1 if lo <= 2 < hi else 0
+    return count + sum(segment.count(1) for _, segment in _sieve_segments(lo, hi))
+
+
+def _parallel_count(n, workers, shards_per_worker=4):
+    bounds = _shard_bounds(n, workers, shards_per_worker)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_shard_count, *zip(*bounds)))
+
+
+def _shard_stats(lo, hi):
+    count = twins = max_gap = gap_start = 0
+    first = last = None
+    if lo <= 2 < hi:
+        count, first, last = 1, 2, 2
+
+    for seg_low, segment in _sieve_segments(lo, hi):
+        start, end = segment.find(1), segment.rfind(1)
+        if start < 0:
+            continue
+        seg_first, seg_last = seg_low + 2 * start, seg_low + 2 * end
+        count += segment.count(1)
+        bits = int.from_bytes(segment, "little")
+        twins += (bits & (bits >> 8)).bit_count()
+
+        if last is not None:
+            twins += seg_first - last == 2
+            if seg_first - last > max_gap:
+                max_gap, gap_start = seg_first - last, last
+        # runs[0] and runs[-1] are empty (the slice starts and ends on a
+        # prime); runs[i] is the zero run after the i-th prime
+        runs = segment[start:end + 1].split(b"\x01")
+        if len(runs) > 2:
+            longest = max(range(1, len(runs) - 1), key=lambda i: len(runs[i]))
+            gap = 2 * (len(runs[longest]) + 1)
+            if gap > max_gap:
+                offset = start + sum(len(run) + 1 for run in runs[:longest]) - 1
+                max_gap, gap_start = gap, seg_low + 2 * offset
+
+        first = seg_first if first is None else first
+        last = seg_last
+    return count, first, last, twins, max_gap, gap_start
+
+
+def prime_stats(n, workers=None, shards_per_worker=4):
+    # Count, twin pairs and the biggest gap for the primes <= n.
+    workers = workers or os.cpu_count() or 1
+    bounds = _shard_bounds(n, workers, shards_per_worker)
+
+    if workers == 1:
+        shards = [_shard_stats(lo, hi) for lo, hi in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(_shard_stats, *zip(*bounds)))
+
+    result = {"count": 0, "twin_pairs": 0, "max_gap": 0, "max_gap_start": None}
+    last = None
+    for count, first, shard_last, twins, max_gap, gap_start in shards:
+        if first is None:
+            continue
+        result["count"] += count
+        result["twin_pairs"] += twins
+        if last is not None:
+            result["twin_pairs"] += first - last == 2
+            if first - last > result["max_gap"]:
+                result["max_gap"], result["max_gap_start"] = first - last, last
+        if max_gap > result["max_gap"]:
+            result["max_gap"], result["max_gap_start"] = max_gap, gap_start
+        last = shard_last
+    return result
+
+
+def benchmark_prime_count(n=10**9, max_workers=None):
+    # Prints the scaling curve: time and speedup for 1, 2, 4, ... workers.
+    max_workers = max_workers or os.cpu_count() or 1
+    workers, base_time = 1, None
+    while True:
+        start = time.perf_counter()
+        count = prime_count(n, workers=workers)
+        elapsed = time.perf_counter() - start
+        base_time = base_time or elapsed
+        print(f"pi({n:,}) = {count:,}  workers={workers:>3}  "
+              f"{elapsed:8.2f} s  speedup x{base_time / elapsed:.2f}")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+
+# The heavier examples only run when this file is executed directly.
+# Importing the module stays cheap, which matters for the worker
+# processes: with the "spawn" start method (macOS, Windows) every
+# worker imports this file again. The pool examples must be here
+# anyway: a pool started while the module is still being imported
+# would wait forever on the import lock.
+if __name__ == "__main__" and "--bench" in sys.argv:
+    bench_args = sys.argv[sys.argv.index("--bench") + 1:]
+    benchmark_prime_count(int(float(bench_args[0])) if bench_args else 10**9)
+elif __name__ == "__main__":
+    print("pi(10**6) =", prime_count(10**6))     # 78498
+    print("10,000th prime =", nth_prime(10_000))  # 104729
+
+    with tempfile.TemporaryDirectory() as folder:
+        table_path = os.path.join(folder, "primes.bin")
+        with PrimeTable(table_path, limit=1000) as table:
+            print("Table limit:", table.limit, "->", [n for n in range(30) if n in table])
+            table.grow(10**6)  # only [1008, 10**6) is sieved
+        with PrimeTable(table_path) as table:  # a later process: just mmap
+            print("Table limit:", table.limit, "| 999983 prime?", table.is_prime(999983))
+    # Table limit: 1008 -> [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    # Table limit: 1000000 | 999983 prime? True
+
+    print("pi(10**6) with 2 workers =", prime_count(10**6, workers=2))  # 78498
+    print("Prime stats up to 10**6:", prime_stats(10**6, workers=2))
+    # {'count': 78498, 'twin_pairs': 8169, 'max_gap': 114, 'max_gap_start': 492113}
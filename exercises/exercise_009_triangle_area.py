@@ -41,3 +41,138 @@ def triangle_area(a, b, c):
 
 # Test cases
 print(triangle_area(3.0, 4.0, 5.0)) # Expected: 6.0
+
+
+print("\n# -----------------------------")
+print("# Stable formula and many triangles at once")
+print("# -----------------------------\n")
+
+# For a "needle" triangle (one side almost as long as the other two
+# together), s - a is a tiny difference of two big, nearly equal
+# numbers, and most of its digits are rounding noise.
+#
+# Kahan's fix: sort the sides so a >= b >= c, then use
+#   A = sqrt((a + (b + c)) * (c - (a - b)) * (c + (a - b)) * (a + (b - c))) / 4
+# The brackets matter: every subtraction is between numbers that are
+# exact enough that no digits are lost.
+# With sorted sides, the triangle is valid exactly when c - (a - b) > 0.
+#
+# triangle_areas() does this for three NumPy arrays of side lengths:
+# the sort, the validity mask and the formula are whole-array
+# operations, and invalid rows come back as NaN instead of None.
+import math
+
+try:
+    import numpy as np  # optional, only used by triangle_areas()
+except ImportError:
+    np = None
+
+
+def triangle_area_stable(a, b, c):
+    a, b, c = sorted((a, b, c), reverse=True)
+    if not c - (a - b) > 0:  # also catches NaN sides
+        return None
+    return math.sqrt((a + (b + c)) * (c - (a - b)) * (c + (a - b)) * (a + (b - c))) / 4
+
+
+def triangle_areas(a, b, c):
+    if np is None:
+        areas = (triangle_area_stable(*sides) for sides in zip(a, b, c))
+        return [math.nan if area is None else area for area in areas]
+
+    sides = np.sort(np.stack(np.broadcast_arrays(a, b, c)).astype(np.float64), axis=0)
+    c, b, a = sides  # ascending sort: a is the longest side
+    valid = c - (a - b) > 0
+    with np.errstate(invalid="ignore"):
+        areas = np.sqrt((a + (b + c)) * (c - (a - b)) * (c + (a - b)) * (a + (b - c))) / 4
+    return np.where(valid, areas, np.nan)
+
+
+# Needle triangle: the exact area is 10.000000077021...
+print(triangle_area(100000.0, 99999.99979, 0.00029))         # 9.9999998096... (textbook Heron)
+print(triangle_area_stable(100000.0, 99999.99979, 0.00029))  # 10.000000077021038
+print(triangle_areas([3.0, 1.0], [4.0, 1.0], [5.0, 3.0]))    # [6.0, nan]
+
+
+print("\n# -----------------------------")
+print("# Streaming: CSV of sides -> CSV of areas")
+print("# -----------------------------\n")
+
+# Loading a whole CSV into lists costs memory proportional to the file.
+# stream_triangle_areas() reads `chunk_rows` rows at a time, computes
+# their areas with triangle_areas(), writes them, and moves on: memory
+# stays the same for a 1 MB or a 100 GB file.
+#
+# Input rows are "a,b,c"; output rows are "a,b,c,area". Sides that are
+# missing or not numbers give an area of nan, like invalid triangles.
+#
+# With workers > 1, chunks are computed in a process pool. At most
+# 2 * workers chunks are in flight, and results are written in the
+# order they were submitted, so the output order matches the input
+# and memory stays bounded.
+#
+# Run:  python exercise_009_triangle_area.py --areas sides.csv areas.csv [workers]
+import csv
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def _chunk_areas(rows):
+    a, b, c = ([_to_float(row[i]) if i < len(row) else math.nan for row in rows]
+               for i in range(3))
+    areas = triangle_areas(a, b, c)
+    return areas.tolist() if np is not None else areas
+
+
+def stream_triangle_areas(in_path, out_path, chunk_rows=65_536, workers=1, header=True):
+    # Returns the number of data rows written.
+    total = 0
+    with open(in_path, "r", newline="", encoding="utf-8") as src, \
+            open(out_path, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        if header:
+            names = next(reader, None)
+            if names is not None:
+                writer.writerow(names[:3] + ["area"])
+
+        def write_chunk(rows, areas):
+            # short rows are padded so the area always lands in column 4
+            writer.writerows((row + ["", "", ""])[:3] + [area] for row, area in zip(rows, areas))
+
+        chunks = iter(lambda: list(islice(reader, chunk_rows)), [])
+        if workers == 1:
+            for rows in chunks:
+                write_chunk(rows, _chunk_areas(rows))
+                total += len(rows)
+            return total
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for rows in chunks:
+                pending.append((rows, pool.submit(_chunk_areas, rows)))
+                if len(pending) >= 2 * workers:
+                    rows, future = pending.popleft()
+                    write_chunk(rows, future.result())
+                    total += len(rows)
+            while pending:
+                rows, future = pending.popleft()
+                write_chunk(rows, future.result())
+                total += len(rows)
+    return total
+
+
+if __name__ == "__main__" and "--areas" in sys.argv:
+    area_args = sys.argv[sys.argv.index("--areas") + 1:]
+    written = stream_triangle_areas(area_args[0], area_args[1],
+                                    workers=int(area_args[2]) if len(area_args) > 2 else 1)
+    print("Rows written:", written)
@@ -25,6 +25,11 @@
 #   13. Binary file write
 #   14. Exceptions
 #   15. print(file=...) usage
+#   16. Large files — read strategies (chunks, mmap, readinto)
+#   17. Line index — random access to any line
+#   18. CSV — parallel parsing of big files
+#   19. CSV — typed columns instead of dicts
+#   20. CSV — lean row objects instead of dicts
 #
 # ============================================================
 
@@ -272,5 +277,709 @@ def print_to_file():
 # -----------------------------
 
 
+# ================================
+# 16. LARGE FILES — READ STRATEGIES
+# ================================
+# f.read() loads the whole file, and decoding it to str makes a second
+# full-size copy, so a 4 GB log needs ~8 GB of RAM. Three ways to read
+# without that:
+#
+#   "chunks"   f.read(buffer_size) in a loop: one chunk in memory at a
+#              time (pass encoding= to get str chunks instead of bytes)
+#   "mmap"     the OS maps the file into memory; you get a memoryview
+#              over it, no copy at all, pages load when touched
+#   "readinto" one bytearray is allocated once and refilled for every
+#              chunk; each piece is a memoryview valid until the next
+#
+# read_with_stats() reads the whole file with one strategy, calls
+# handle(piece) on every piece, and reports the throughput.
+import mmap
+import os
+import time
+
+DEFAULT_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+
+def read_chunks(path, buffer_size=DEFAULT_BUFFER_SIZE, encoding=None):
+    mode = "r" if encoding else "rb"
+    with open(path, mode, encoding=encoding) as f:
+        while True:
+            chunk = f.read(buffer_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def read_mmap(path, buffer_size=None):
+    # One piece: the whole file as a memoryview (buffer_size is unused).
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")  # an empty file cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def read_into(path, buffer_size=DEFAULT_BUFFER_SIZE):
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            yield view[:size]
+
+
+READ_STRATEGIES = {
+    "chunks": read_chunks,
+    "mmap": read_mmap,
+    "readinto": read_into,
+}
+
+
+def read_with_stats(path, strategy="chunks", buffer_size=DEFAULT_BUFFER_SIZE, handle=None):
+    start = time.perf_counter()
+    pieces = 0
+    for piece in READ_STRATEGIES[strategy](path, buffer_size):
+        if handle is not None:
+            handle(piece)
+        pieces += 1
+    seconds = time.perf_counter() - start
+
+    size = os.path.getsize(path)
+    mib_per_s = size / (1 << 20) / seconds if seconds else float("inf")
+    print(f"{strategy:>8}: {size:,} bytes in {pieces} pieces, "
+          f"{seconds:.3f} s, {mib_per_s:.1f} MiB/s")
+    return {"strategy": strategy, "bytes": size, "pieces": pieces,
+            "seconds": seconds, "mib_per_s": mib_per_s}
+
+
+def compare_read_strategies(path="example.txt", buffer_size=DEFAULT_BUFFER_SIZE):
+    found = []
+    for strategy in READ_STRATEGIES:
+        newlines = 0
+
+        def count_newlines(piece):
+            # copy at most buffer_size bytes at a time, even for mmap
+            nonlocal newlines
+            for i in range(0, len(piece), buffer_size):
+                newlines += bytes(piece[i:i + buffer_size]).count(b"\n")
+
+        read_with_stats(path, strategy, buffer_size, handle=count_newlines)
+        found.append(newlines)
+    print("Newlines found:", found)
+
+# -----------------------------
+# Example Output (for a 2 GB log):
+#   chunks: 2,147,483,648 bytes in 2048 pieces, 1.402 s, 1460.7 MiB/s
+#     mmap: 2,147,483,648 bytes in 1 pieces, 0.911 s, 2248.1 MiB/s
+# readinto: 2,147,483,648 bytes in 2048 pieces, 1.105 s, 1853.4 MiB/s
+# Newlines found: [21474836, 21474836, 21474836]
+# -----------------------------
+
+
+# ================================
+# 17. LINE INDEX — RANDOM ACCESS TO ANY LINE
+# ================================
+# read_lines() can only start at the top, so reading line 90,000,000
+# means reading the 89,999,999 lines before it. A line index fixes
+# that: scan the file once, remember where every line starts, and
+# later jump straight there with f.seek().
+#
+# The index is a sidecar file next to the data (example.txt.idx):
+#   header: 3 x 8 bytes — magic, data file size, data file mtime (ns)
+#   body:   array('Q') of byte offsets, one per line start
+# The offsets come from accumulate(map(len, f)) over a binary file,
+# which runs in C; they are written in blocks, never all in memory.
+#
+# update_line_index() compares the stored size/mtime with the file:
+#   same size and mtime  -> index is current, nothing to do
+#   file got bigger      -> it was appended to: scan only the new part
+#                           (starting at the last, maybe unfinished, line)
+#   anything else        -> rebuild from scratch
+#
+# LineFile maps the index with mmap, so opening it is instant even for
+# 100M lines; lines[i] and lines[a:b] cost one seek and one read.
+# Lines are returned without their line ending.
+from array import array
+from itertools import accumulate, islice, takewhile
+
+_INDEX_MAGIC = 0x4C494E45494458  # "LINEIDX"
+_INDEX_HEADER_SIZE = 3 * 8
+_INDEX_BLOCK = 1 << 16  # offsets per write
+
+
+def _write_offsets(index_file, offsets):
+    while True:
+        block = array("Q", islice(offsets, _INDEX_BLOCK))
+        if not block:
+            break
+        block.tofile(index_file)
+
+
+def update_line_index(path, index_path=None):
+    index_path = index_path or path + ".idx"
+    stat = os.stat(path)
+    size = stat.st_size
+
+    stored_size = stored_mtime = None
+    if os.path.exists(index_path) and os.path.getsize(index_path) > _INDEX_HEADER_SIZE:
+        header = array("Q")
+        with open(index_path, "rb") as f:
+            header.frombytes(f.read(_INDEX_HEADER_SIZE))
+        if header[0] == _INDEX_MAGIC:
+            stored_size, stored_mtime = header[1], header[2]
+
+    if stored_size == size and stored_mtime == stat.st_mtime_ns:
+        return index_path  # up to date
+    appended = stored_size is not None and stored_size < size
+
+    with open(path, "rb") as data, open(index_path, "r+b" if appended else "wb") as index:
+        data.seek(max(size - 1, 0))
+        ends_with_newline = data.read(1) == b"\n"
+
+        if appended:
+            index.seek(-8, os.SEEK_END)
+            resume_from = array("Q", index.read(8))[0]
+        else:
+            array("Q", [_INDEX_MAGIC, 0, 0, 0]).tofile(index)  # header + offset 0
+            resume_from = 0
+
+        # a line ending in b"\n" at `end` means the next line starts at `end`;
+        # stop at the size seen above, in case the file is still growing
+        data.seek(resume_from)
+        ends = accumulate(map(len, data), initial=resume_from)
+        next(ends)  # resume_from is already stored
+        ends = takewhile(lambda end: end < size or (end == size and ends_with_newline), ends)
+        _write_offsets(index, ends)
+
+        index.seek(0)
+        array("Q", [_INDEX_MAGIC, size, stat.st_mtime_ns]).tofile(index)
+    return index_path
+
+
+class LineFile:
+    def __init__(self, path, encoding="utf-8", index_path=None):
+        index_path = update_line_index(path, index_path)
+        self.encoding = encoding
+        self._data = open(path, "rb")
+        with open(index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # the size the index was built for, not the current one: lines
+        # appended since then are not indexed, so they are not read
+        self._size = array("Q", self._index[:_INDEX_HEADER_SIZE])[1]
+        self._offsets = memoryview(self._index)[_INDEX_HEADER_SIZE:].cast("Q")
+        # the last offset is the file size when the file ends with b"\n"
+        self._count = len(self._offsets) - (self._offsets[-1] == self._size)
+
+    def __len__(self):
+        return self._count
+
+    def _span(self, start, stop):
+        # bytes of lines start..stop-1 in one read
+        first = self._offsets[start]
+        last = self._offsets[stop] if stop < len(self._offsets) else self._size
+        self._data.seek(first)
+        return self._data.read(last - first).decode(self.encoding)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            return [line.rstrip("\r") for line in self._span(start, stop).split("\n")[:stop - start]]
+        if item < 0:
+            item += self._count
+        if not 0 <= item < self._count:
+            raise IndexError("line index out of range")
+        return self._span(item, item + 1).rstrip("\n").rstrip("\r")
+
+    def close(self):
+        self._offsets.release()
+        self._index.close()
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def line_index_demo():
+    with LineFile("example.txt") as lines:
+        print(len(lines), "lines")
+        print(lines[-1])
+        print(lines[0:2])
+
+# -----------------------------
+# Example Output (example.txt from sections 3 and 4):
+# 3 lines
+# Appended line.
+# ['Hello, world!', 'Second line.']
+# -----------------------------
+
+
+# ================================
+# 18. CSV — PARALLEL PARSING OF BIG FILES
+# ================================
+# csv.reader uses one CPU core. To use all of them, cut the file into
+# byte ranges and parse each range in its own process.
+#
+# The hard part is where to cut: a cut must fall right after a newline
+# that ends a record, not one inside a quoted field like
+#   1,"line one
+#   line two",3
+# In standard CSV a quote inside a field is written as "", so every
+# quote character flips "inside quotes" on or off. A newline ends a
+# record exactly when the number of quotes before it is even.
+#
+# csv_record_boundaries() finds those cut points in one quick pass
+# (bytes.find/bytes.count run in C, much faster than parsing), aiming
+# for ranges of about chunk_bytes. csv_parallel_batches() then parses
+# the ranges in a process pool and yields one list of rows per range,
+# in file order, with at most 2 * workers ranges in flight.
+#
+# The quote-parity rule only holds for doubled quotes, so the csv
+# options (fmtparams) are checked first: any quotechar works (it is
+# passed to the scan), but escapechar, doublequote=False and
+# QUOTE_NONE raise ValueError. Assumes an ASCII-compatible encoding
+# such as UTF-8.
+import io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+_SCAN_BLOCK = 1 << 20
+
+
+def csv_record_boundaries(path, chunk_bytes=16 << 20, quotechar=b'"'):
+    boundaries = [0]
+    target = chunk_bytes   # next cut should be at or after this offset
+    quotes = 0             # quote characters before the current block
+    position = 0           # file offset of the current block
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_SCAN_BLOCK)
+            if not block:
+                break
+            search_from = max(target - position, 0)
+            counted_to = 0
+            parity = quotes
+            while search_from < len(block):
+                newline = block.find(b"\n", search_from)
+                if newline < 0:
+                    break
+                parity += block.count(quotechar, counted_to, newline)
+                counted_to = newline
+                if parity % 2 == 0:
+                    boundaries.append(position + newline + 1)
+                    target = position + newline + 1 + chunk_bytes
+                    search_from = max(target - position, newline + 1)
+                else:
+                    search_from = newline + 1
+            quotes += block.count(quotechar)
+            position += len(block)
+    if boundaries[-1] < position:
+        boundaries.append(position)
+    return boundaries
+
+
+def _parse_csv_range(path, start, stop, encoding, fmtparams):
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(stop - start).decode(encoding)
+    return list(csv.reader(io.StringIO(text, newline=""), **fmtparams))
+
+
+def _scan_quotechar(encoding, fmtparams):
+    # the dialect csv.reader would use, so "dialect=..." is checked too
+    dialect = csv.reader(io.StringIO(), **fmtparams).dialect
+    if dialect.quoting == csv.QUOTE_NONE or dialect.escapechar is not None \
+            or not dialect.doublequote:
+        raise ValueError("parallel CSV parsing needs doubled-quote quoting: "
+                         "escapechar, doublequote=False and QUOTE_NONE are not supported")
+    quotechar = dialect.quotechar.encode(encoding)
+    if len(quotechar) != 1:
+        raise ValueError(f"quotechar {dialect.quotechar!r} must be one byte in {encoding}")
+    return quotechar
+
+
+def csv_parallel_batches(path, workers=None, chunk_bytes=16 << 20, encoding="utf-8", **fmtparams):
+    workers = workers or os.cpu_count() or 1
+    boundaries = csv_record_boundaries(path, chunk_bytes, _scan_quotechar(encoding, fmtparams))
+    ranges = zip(boundaries, boundaries[1:])
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = 2 * workers
+        pending = deque()
+        for start, stop in ranges:
+            pending.append(pool.submit(_parse_csv_range, path, start, stop, encoding, fmtparams))
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def csv_parallel_read():
+    for batch in csv_parallel_batches("data.csv", workers=4):
+        for row in batch:
+            print(row)
+
+# -----------------------------
+# Example Output (same rows as csv_read(), parsed by worker processes):
+# ['Name', 'Age', 'Country']
+# ['Alex', '32', 'Moldova']
+# ['Maria', '28', 'Romania']
+# -----------------------------
+
+
+# ================================
+# 19. CSV — TYPED COLUMNS INSTEAD OF DICTS
+# ================================
+# csv.DictReader builds a dict per row and keeps every value as a str:
+# a 3-byte "Age" field costs a str (~52 bytes) plus its dict slot.
+# read_csv_columns() stores each column in one compact container:
+#
+#   "int"       array('q')  — 8 bytes per value
+#   "float"     array('d')  — 8 bytes per value, empty cells are nan
+#   "category"  array('I') of codes + one list of distinct values,
+#               so "Moldova" is stored once, not once per row
+#   "str"       list of str
+#
+# Types come from `schema` ({"Age": "int", ...}) or are guessed from
+# the first `sample_rows` rows: int if every value parses as int,
+# else float, else category when at most half the values are distinct,
+# else str. A guessed column that later meets a value it cannot hold
+# is widened (int -> float -> str) and the file is read again, while
+# a column from `schema` raises ValueError with the line number.
+# Blank lines are skipped, as DictReader does.
+#
+# Numbers are parsed strictly: int() and float() also accept "1_000"
+# and " 7 ", which would silently change the data, so a cell must be
+# plain digits (with an optional sign, point and exponent, or
+# nan/inf) to count as a number. An int too big for array('q') widens
+# its column to str, which keeps the exact text.
+#
+# The result is a small CsvTable: table["Age"] is the column,
+# table.row(i) rebuilds one row, and table.to_numpy("Age") gives a
+# NumPy view of a numeric column without copying (for a category
+# column, a view of its codes).
+import math
+import re
+
+_TYPECODES = {"int": "q", "float": "d"}
+COLUMN_TYPES = ("int", "float", "category", "str")
+_INT_TEXT = re.compile(r"[+-]?[0-9]+")
+_FLOAT_TEXT = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+                         r"|[+-]?(?:nan|inf|infinity)", re.IGNORECASE)
+
+
+def _parse_int(text):
+    if not _INT_TEXT.fullmatch(text):
+        raise ValueError(f"not an int: {text!r}")
+    return int(text)
+
+
+def _parse_float(text):
+    if not text:
+        return math.nan
+    if not _FLOAT_TEXT.fullmatch(text):
+        raise ValueError(f"not a float: {text!r}")
+    return float(text)
+
+
+class CategoryColumn:
+    def __init__(self, values=()):
+        self.codes = array("I")
+        self.categories = []
+        self._lookup = {}
+        for value in values:
+            self.append(value)
+
+    def append(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.categories[self.codes[index]]
+
+    def __iter__(self):
+        categories = self.categories
+        return (categories[code] for code in self.codes)
+
+
+def _guess_type(values):
+    for kind, parse in (("int", _parse_int), ("float", _parse_float)):
+        try:
+            for value in values:
+                parse(value)
+            return kind
+        except ValueError:
+            pass
+    return "category" if len(set(values)) * 2 <= len(values) else "str"
+
+
+def _new_column(kind, values=()):
+    if kind in _TYPECODES:
+        return array(_TYPECODES[kind], values)
+    if kind == "category":
+        return CategoryColumn(values)
+    return list(values)
+
+
+class CsvTable:
+    def __init__(self, names, types, columns):
+        self.names = names
+        self.types = types
+        self.columns = dict(zip(names, columns))
+
+    def __len__(self):
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row(self, index):
+        return tuple(self.columns[name][index] for name in self.names)
+
+    def to_numpy(self, name):
+        import numpy as np  # optional dependency, only needed here
+        column = self.columns[name]
+        if isinstance(column, CategoryColumn):
+            return np.frombuffer(column.codes, dtype=np.uint32)
+        if not isinstance(column, array):
+            raise ValueError(f"column {name!r} is {self.types[self.names.index(name)]}, "
+                             "not a numeric column")
+        return np.frombuffer(column, dtype=column.typecode)
+
+
+def _fill_columns(f, names, types, guessed):
+    # one pass over the data rows; returns the columns, or
+    # (index, wider type) when a guessed column has to be widened
+    columns = [_new_column(kind) for kind in types]
+    parsers = [_parse_int if kind == "int" else _parse_float if kind == "float" else None
+               for kind in types]
+    f.seek(0)
+    rows = csv.reader(f)
+    reader = filter(None, rows)  # skip blank lines, like DictReader
+    next(reader, None)
+    for row in reader:
+        if len(row) != len(names):
+            raise ValueError(f"line {rows.line_num}: expected {len(names)} fields, "
+                             f"got {len(row)}")
+        for i, value in enumerate(row):
+            parse = parsers[i]
+            if parse is None:
+                columns[i].append(value)
+                continue
+            try:
+                columns[i].append(parse(value))
+            except (ValueError, OverflowError) as error:
+                if not guessed[i]:
+                    raise ValueError(f"line {rows.line_num}: {names[i]}={value!r} "
+                                     f"is not {types[i]}")
+                if types[i] == "int" and not isinstance(error, OverflowError):
+                    try:
+                        _parse_float(value)
+                        return i, "float"
+                    except ValueError:
+                        pass
+                return i, "str"
+    return columns
+
+
+def read_csv_columns(path, schema=None, sample_rows=1000, encoding="utf-8"):
+    schema = schema or {}
+    for name, kind in schema.items():
+        if kind not in COLUMN_TYPES:
+            raise ValueError(f"unknown type {kind!r} for column {name!r}, "
+                             f"expected one of {COLUMN_TYPES}")
+    with open(path, "r", newline="", encoding=encoding) as f:
+        reader = filter(None, csv.reader(f))
+        names = next(reader, [])
+        sample = list(islice(reader, sample_rows))
+
+        types = [schema.get(name) or _guess_type([row[i] for row in sample if i < len(row)])
+                 for i, name in enumerate(names)]
+        guessed = [name not in schema for name in names]
+
+        # Widening restarts the read with the wider type, so every cell is
+        # parsed from its original text ("007" stays "007" in a str column).
+        # Each column can widen at most twice (int -> float -> str).
+        while True:
+            columns = _fill_columns(f, names, types, guessed)
+            if isinstance(columns, list):
+                break
+            i, kind = columns
+            types[i] = kind
+
+    return CsvTable(names, types, columns)
+
+
+def csv_columns_read():
+    table = read_csv_columns("data.csv")
+    print(table.types)
+    print(table["Age"])
+    print(table.row(0))
+
+# -----------------------------
+# Example Output (data.csv from section 7):
+# ['str', 'int', 'str']
+# array('q', [32, 28])
+# ('Alex', 32, 'Moldova')
+# -----------------------------
+
+
+# ================================
+# 20. CSV — LEAN ROW OBJECTS INSTEAD OF DICTS
+# ================================
+# DictReader gives every row its own dict: one hash table per row
+# plus hashing each header name again for every row. All rows share
+# the same header, so the names only need to be stored once — in a
+# class. make_row_class() builds one tuple subclass per header:
+#
+#   Row = make_row_class(["Name", "Age", "Country"])
+#   row = Row(["Alex", "32", "Moldova"])
+#   row.Name, row["Age"], row[2]   ->  'Alex', '32', 'Moldova'
+#
+# Values are stored by position (it is a tuple, with __slots__ = ()
+# so there is no per-row __dict__). Each name is a property that
+# reads its position, and row["Age"] looks the position up in one
+# dict shared by every row. Headers that are not valid identifiers
+# (e.g. "First Name") or that clash with tuple methods (e.g. "count")
+# still work with row["First Name"] / row["count"].
+#
+# read_csv_rows() follows DictReader for uneven rows: blank lines are
+# skipped and a short row is padded with `restval` (None by default).
+# Extra fields of a long row stay in the tuple, reachable by index
+# (DictReader puts them in a list under the key None).
+#
+# benchmark_row_readers() compares DictReader and read_csv_rows():
+# rows/s for a plain pass, and peak tracemalloc memory while keeping
+# every row in a list (what a program that loads the file does).
+# With 10M rows DictReader needs several GB for that list.
+import operator
+import tracemalloc
+from functools import partial
+from keyword import iskeyword
+
+
+def make_row_class(header, name="Row"):
+    header = tuple(header)
+    positions = {field: i for i, field in enumerate(header)}
+
+    def __new__(cls, values):
+        return tuple.__new__(cls, values)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = positions[key]
+        return tuple.__getitem__(self, key)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={value!r}" for field, value in zip(header, self))
+        return f"{name}({fields})"
+
+    def _asdict(self):
+        return dict(zip(header, self))
+
+    namespace = {
+        "__slots__": (),
+        "__new__": __new__,
+        "__getitem__": __getitem__,
+        "__repr__": __repr__,
+        "_asdict": _asdict,
+        "_fields": header,
+    }
+    for i, field in enumerate(header):
+        if field.isidentifier() and not iskeyword(field) and field not in namespace \
+                and not hasattr(tuple, field):
+            namespace[field] = property(operator.itemgetter(i))
+    return type(name, (tuple,), namespace)
+
+
+def read_csv_rows(f, restval=None):
+    reader = csv.reader(f)
+    header = next(reader, [])
+    row_class = make_row_class(header)
+    make = partial(tuple.__new__, row_class)
+    width = len(header)
+    for row in reader:
+        if len(row) < width:
+            if not row:
+                continue  # blank line
+            row += [restval] * (width - len(row))
+        yield make(row)
+
+
+def csv_row_read():
+    row = None
+    with open("data.csv", "r", newline="", encoding="utf-8") as f:
+        for row in read_csv_rows(f):
+            print(row.Name, row["Age"])
+    print("Last row:", row)
+
+
+def make_rows_file(path, rows):
+    countries = ["Moldova", "Romania", "Italy", "Spain"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Age", "Country"])
+        writer.writerows((f"user{i}", 18 + i % 60, countries[i % 4]) for i in range(rows))
+
+
+def benchmark_row_readers(path="rows.csv", rows=10_000_000):
+    if not os.path.exists(path):
+        make_rows_file(path, rows)
+    readers = {
+        "DictReader": csv.DictReader,
+        "row class": read_csv_rows,
+    }
+    for label, reader in readers.items():
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            start = time.perf_counter()
+            count = 0
+            for row in reader(f):
+                count += 1
+            elapsed = time.perf_counter() - start
+
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            tracemalloc.start()
+            kept = list(reader(f))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        del kept
+
+        print(f"{label:>10}: {count:,} rows, {count / elapsed:,.0f} rows/s, "
+              f"peak {peak / 2**20:,.1f} MiB")
+
+# -----------------------------
+# Example Output (csv_row_read):
+# Alex 32
+# Maria 28
+# Last row: Row(Name='Maria', Age='28', Country='Romania')
+#
+# Example Output (benchmark_row_readers, rows=500_000; memory grows
+# linearly, so 10M rows peak at about 20x these numbers):
+# DictReader: 500,000 rows, 435,173 rows/s, peak 170.3 MiB
+#  row class: 500,000 rows, 962,826 rows/s, peak 116.9 MiB
+# -----------------------------
+
+
 if __name__ == "__main__":
     print("Run individual functions to test file operations.")